@@ -6,8 +6,13 @@ Check for non-standard characters in CSV file
 import csv
 import re
 import unicodedata
+import numpy as np
 from collections import defaultdict
 
+# Problematic whitespace/invisible characters: non-breaking space plus
+# EN SPACE (U+2002) through ZERO WIDTH SPACE (U+200B)
+SPECIAL_WS = frozenset('\xa0\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u200b')
+
 def find_nonstandard_characters(file_path):
     """Find and report non-standard characters in CSV file"""
     
@@ -16,35 +21,50 @@ def find_nonstandard_characters(file_path):
     special_chars = defaultdict(list)
     unicode_chars = defaultdict(list)
     
-    # Standard ASCII printable characters (32-126)
-    standard_ascii = set(chr(i) for i in range(32, 127))
+    with open(file_path, 'r', encoding='utf-8') as file:
+        text = file.read()
     
-    line_num = 0
+    # Decode once into a code point array and flag everything outside
+    # standard ASCII printable characters (32-126) in a single vectorized pass
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    bad = np.flatnonzero((codes < 32) | (codes > 126))
     
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            line_num += 1
-            
-            for pos, char in enumerate(line):
-                # Check for non-standard characters
-                if char not in standard_ascii:
-                    char_info = {
-                        'char': char,
-                        'unicode_name': unicodedata.name(char, 'UNKNOWN'),
-                        'unicode_code': f'U+{ord(char):04X}',
-                        'line': line_num,
-                        'position': pos,
-                        'context': line[max(0, pos-10):pos+10].strip()
-                    }
-                    
-                    if ord(char) > 127:
-                        unicode_chars[char].append(char_info)
-                    else:
-                        nonstandard_chars[char].append(char_info)
-                
-                # Also check for specific problematic characters
-                if char in ['\xa0', '\u2009', '\u2002', '\u2003', '\u2004', '\u2005', '\u2006', '\u2007', '\u2008', '\u200a', '\u200b']:
-                    special_chars[char].append(char_info)
+    # Line boundaries, so flagged offsets can be mapped back to line/position
+    newlines = np.flatnonzero(codes == 0x0A)
+    line_starts = np.concatenate(([0], newlines + 1)).tolist()
+    line_ends = np.append(newlines + 1, len(codes)).tolist()
+    line_num = len(newlines) + (1 if text and not text.endswith('\n') else 0)
+    
+    # Look up names once per distinct flagged code point, not per occurrence
+    unicode_names = {}
+    unicode_codes = {}
+    for code in np.unique(codes[bad]).tolist():
+        unicode_names[code] = unicodedata.name(chr(code), 'UNKNOWN')
+        unicode_codes[code] = f'U+{code:04X}'
+    
+    # Only the (typically sparse) flagged characters are visited in Python
+    for i, line_idx in zip(bad.tolist(), np.searchsorted(newlines, bad).tolist()):
+        char = text[i]
+        code = ord(char)
+        start = line_starts[line_idx]
+        pos = i - start
+        char_info = {
+            'char': char,
+            'unicode_name': unicode_names[code],
+            'unicode_code': unicode_codes[code],
+            'line': line_idx + 1,
+            'position': pos,
+            'context': text[start + max(0, pos-10):min(i+10, line_ends[line_idx])].strip()
+        }
+        
+        if code > 127:
+            unicode_chars[char].append(char_info)
+        else:
+            nonstandard_chars[char].append(char_info)
+        
+        # Also check for specific problematic characters
+        if char in SPECIAL_WS:
+            special_chars[char].append(char_info)
     
     # Report findings
     print("=== NON-STANDARD CHARACTER ANALYSIS ===\n")
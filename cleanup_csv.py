@@ -4,12 +4,72 @@ Clean up non-standard characters in CSV file
 """
 
 import csv
+import io
+import mmap
 import re
+import shutil
 import unicodedata
 import os
+import pandas as pd
 from datetime import datetime
 
-def clean_csv_file(input_file, output_file=None, backup=True):
+# Problematic Unicode whitespace characters, mapped to a regular space
+UNICODE_WHITESPACE = (
+    '\u2009',  # THIN SPACE
+    '\u2002',  # EN SPACE
+    '\u2003',  # EM SPACE
+    '\u2004',  # THREE-PER-EM SPACE
+    '\u2005',  # FOUR-PER-EM SPACE
+    '\u2006',  # SIX-PER-EM SPACE
+    '\u2007',  # FIGURE SPACE
+    '\u2008',  # PUNCTUATION SPACE
+    '\u200a',  # HAIR SPACE
+    '\u200b',  # ZERO WIDTH SPACE
+)
+_UNICODE_WS_RE = re.compile('[' + ''.join(UNICODE_WHITESPACE) + ']')
+# Any run of regular, non-breaking or Unicode whitespace collapses to one space
+_ALLWS_RUN = re.compile('[ \xa0' + ''.join(UNICODE_WHITESPACE) + ']+')
+# Whitespace around field separators and line boundaries (per-cell strip)
+_FIELD_EDGE_WS = re.compile(r'[^\S\n]*(,|^|$)[^\S\n]*', re.MULTILINE)
+# Non-empty lines that clean down to nothing; csv.writer quotes these as ""
+_BLANK_CELL_LINE = re.compile('^(?:[^\\S\\n]|[' + ''.join(UNICODE_WHITESPACE) + '])+$', re.MULTILINE)
+# A quoted field that spans a whole cell, the only quoting csv.reader and
+# pd.read_csv agree on
+_QUOTED_FIELD = re.compile(r'(?<![^,\n])"(?:[^"]|"")*+"(?![^,\n])')
+# UTF-8 encodings of U+00A0 and U+2002 through U+200B
+_NONSTANDARD_BYTES = re.compile(rb'\xc2\xa0|\xe2\x80[\x82-\x8b]')
+
+def clean_unquoted_text(data):
+    """Clean CSV text that has no quoted fields in a few whole-text passes"""
+    cleaned = _ALLWS_RUN.sub(' ', data)
+    cleaned = _FIELD_EDGE_WS.sub(r'\1', cleaned)
+    
+    # Match csv.writer output: every row terminated with \r\n
+    if data and not data.endswith('\n'):
+        cleaned += '\n'
+    return cleaned.replace('\n', '\r\n')
+
+def read_csv_as_strings(data):
+    """Parse CSV text into an all-string DataFrame, or None if pandas would read it differently"""
+    # pd.read_csv strips a leading BOM, drops blank and whitespace-only lines,
+    # pads short rows and parses stray quotes its own way, so only regular
+    # text is handed to it
+    if not data or data.startswith('\ufeff'):
+        return None
+    
+    # With every quoted field replaced by a placeholder, each line is one row
+    skeleton = _QUOTED_FIELD.sub('q', data)
+    if '"' in skeleton:
+        return None
+    lines = skeleton.removesuffix('\n').split('\n')
+    if not all(lines) or _BLANK_CELL_LINE.search(skeleton):
+        return None
+    if len({line.count(',') for line in lines}) != 1:
+        return None
+    
+    return pd.read_csv(io.StringIO(data), header=None, dtype=object, keep_default_na=False)
+
+def clean_csv_file(input_file, output_file=None, backup=True, verbose=False):
     """Clean non-standard characters from CSV file"""
     
     if output_file is None:
@@ -21,8 +81,7 @@ def clean_csv_file(input_file, output_file=None, backup=True):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = f"{os.path.splitext(input_file)[0]}_backup_{timestamp}.csv"
         print(f"Creating backup: {backup_file}")
-        with open(input_file, 'r', encoding='utf-8') as src, open(backup_file, 'w', encoding='utf-8') as dst:
-            dst.write(src.read())
+        shutil.copyfile(input_file, backup_file)
     
     # Track changes
     changes_made = {
@@ -35,56 +94,54 @@ def clean_csv_file(input_file, output_file=None, backup=True):
     print(f"Output file: {output_file}")
     print()
     
-    with open(input_file, 'r', encoding='utf-8') as infile, \
-         open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+    with open(input_file, 'r', encoding='utf-8') as infile:
+        data = infile.read()
+    
+    # Every character outside the CSV structure lands in some cell, so the
+    # replacements can be counted once over the whole text
+    changes_made['non_breaking_spaces'] = data.count('\xa0')
+    changes_made['other_unicode'] = len(_UNICODE_WS_RE.findall(data))
+    
+    unquoted = '"' not in data and not _BLANK_CELL_LINE.search(data)
+    df = None if unquoted else read_csv_as_strings(data)
+    
+    if unquoted:
+        # No quoting to honour, so clean the whole text at once instead of
+        # parsing and re-serializing every row
+        changes_made['lines_processed'] = data.count('\n') + (1 if data and not data.endswith('\n') else 0)
         
-        reader = csv.reader(infile)
-        writer = csv.writer(outfile)
+        with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+            outfile.write(clean_unquoted_text(data))
+    elif df is not None:
+        # Replace whitespace characters, collapse consecutive spaces and strip
+        # every cell a column at a time
+        for column in df.columns:
+            df[column] = df[column].str.replace(_ALLWS_RUN.pattern, ' ', regex=True).str.strip()
         
-        for row_num, row in enumerate(reader, 1):
-            cleaned_row = []
+        df.to_csv(output_file, header=False, index=False, encoding='utf-8', lineterminator='\r\n')
+        changes_made['lines_processed'] = len(df)
+    else:
+        # Irregular rows or quoting: fall back to cleaning row by row
+        with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+            reader = csv.reader(io.StringIO(data))
+            writer = csv.writer(outfile)
             
-            for cell in row:
-                original_cell = cell
-                
-                # Replace non-breaking spaces with regular spaces
-                cleaned_cell = cell.replace('\xa0', ' ')
-                if cleaned_cell != cell:
-                    changes_made['non_breaking_spaces'] += cell.count('\xa0')
-                
-                # Replace other problematic Unicode whitespace characters
-                unicode_whitespace = [
-                    '\u2009',  # THIN SPACE
-                    '\u2002',  # EN SPACE
-                    '\u2003',  # EM SPACE
-                    '\u2004',  # THREE-PER-EM SPACE
-                    '\u2005',  # FOUR-PER-EM SPACE
-                    '\u2006',  # SIX-PER-EM SPACE
-                    '\u2007',  # FIGURE SPACE
-                    '\u2008',  # PUNCTUATION SPACE
-                    '\u200a',  # HAIR SPACE
-                    '\u200b',  # ZERO WIDTH SPACE
-                ]
+            for row_num, row in enumerate(reader, 1):
+                cleaned_row = []
                 
-                for unicode_char in unicode_whitespace:
-                    if unicode_char in cleaned_cell:
-                        changes_made['other_unicode'] += cleaned_cell.count(unicode_char)
-                        cleaned_cell = cleaned_cell.replace(unicode_char, ' ')
+                for cell in row:
+                    # Replace whitespace characters and collapse consecutive
+                    # spaces in one pass, then strip leading/trailing whitespace
+                    cleaned_cell = _ALLWS_RUN.sub(' ', cell).strip()
+                    
+                    cleaned_row.append(cleaned_cell)
                 
-                # Clean up multiple consecutive spaces
-                cleaned_cell = re.sub(r' +', ' ', cleaned_cell)
+                writer.writerow(cleaned_row)
+                changes_made['lines_processed'] += 1
                 
-                # Strip leading/trailing whitespace
-                cleaned_cell = cleaned_cell.strip()
-                
-                cleaned_row.append(cleaned_cell)
-            
-            writer.writerow(cleaned_row)
-            changes_made['lines_processed'] += 1
-            
-            # Show progress every 100 lines
-            if row_num % 100 == 0:
-                print(f"Processed {row_num} lines...")
+                # Show progress every 100 lines
+                if verbose and row_num % 100 == 0:
+                    print(f"Processed {row_num} lines...")
     
     # Report results
     print(f"\n✅ Cleaning completed!")
@@ -105,13 +162,12 @@ def verify_cleaning(original_file, cleaned_file):
     
     # Count non-standard characters in both files
     def count_nonstandard(file_path):
-        nonstandard_count = 0
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            nonstandard_count = content.count('\xa0')
-            for unicode_char in ['\u2009', '\u2002', '\u2003', '\u2004', '\u2005', '\u2006', '\u2007', '\u2008', '\u200a', '\u200b']:
-                nonstandard_count += content.count(unicode_char)
-        return nonstandard_count
+        # Scan the raw UTF-8 bytes once through a memory map, no decoding
+        if os.path.getsize(file_path) == 0:
+            return 0
+        with open(file_path, 'rb') as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sum(1 for _ in _NONSTANDARD_BYTES.finditer(mm))
     
     original_count = count_nonstandard(original_file)
     cleaned_count = count_nonstandard(cleaned_file)
@@ -3,9 +3,34 @@
 Convert Excel file to CSV format
 """
 
+import csv
 import pandas as pd
 import sys
 import os
+from openpyxl import load_workbook
+
+def _trim_row(row):
+    """Drop a row's trailing empty cells, which formatting-only cells leave behind"""
+    end = len(row)
+    while end and row[end - 1] in (None, ''):
+        end -= 1
+    return row[:end]
+
+def _dedupe_columns(columns, unnamed):
+    """Rename repeated column names to X.1, X.2, ... the way pd.read_excel does"""
+    # Named columns are numbered before the generated "Unnamed: i" ones, and
+    # a suffix that another column already uses is skipped
+    counts = {}
+    for i in [i for i in range(len(columns)) if i not in unnamed] + unnamed:
+        name = base = columns[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in columns else counts.get(name, 0)
+        columns[i] = name
+        counts[name] = count + 1
+    return columns
 
 def convert_excel_to_csv(excel_file_path, output_csv_path=None):
     """Convert Excel file to CSV"""
@@ -13,9 +38,9 @@ def convert_excel_to_csv(excel_file_path, output_csv_path=None):
         # Read the Excel file
         print(f"Reading Excel file: {excel_file_path}")
         
-        # First, let's see what sheets are available
-        excel_file = pd.ExcelFile(excel_file_path)
-        print(f"Available sheets: {excel_file.sheet_names}")
+        # Read the workbook's cell values directly instead of building a DataFrame
+        workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+        print(f"Available sheets: {workbook.sheetnames}")
         
         # If no output path specified, create one based on input filename
         if output_csv_path is None:
@@ -23,18 +48,42 @@ def convert_excel_to_csv(excel_file_path, output_csv_path=None):
             output_csv_path = f"{base_name}.csv"
         
         # Read the first sheet (or specify sheet name if needed)
-        df = pd.read_excel(excel_file_path, sheet_name=0)
+        worksheet = workbook.worksheets[0]
         
-        print(f"Excel file shape: {df.shape} (rows, columns)")
-        print(f"Column names: {list(df.columns)}")
+        # The sheet dimensions include formatting-only cells, so drop trailing
+        # empty cells and rows and pad the rest to the widest row, as
+        # pd.read_excel does
+        rows = []
+        last_row = -1
+        for row_num, row in enumerate(worksheet.iter_rows(values_only=True)):
+            row = _trim_row(row)
+            if row:
+                last_row = row_num
+            rows.append(row)
+        workbook.close()
+        del rows[last_row + 1:]
+        width = max(map(len, rows), default=0)
+        rows = [row + (None,) * (width - len(row)) for row in rows]
+        
+        # Name empty and repeated header cells like pandas
+        header = rows.pop(0) if rows else ()
+        unnamed = [i for i, name in enumerate(header) if name in (None, '')]
+        columns = _dedupe_columns([f"Unnamed: {i}" if i in unnamed else name
+                                   for i, name in enumerate(header)], unnamed)
         
         # Save to CSV
-        df.to_csv(output_csv_path, index=False)
+        with open(output_csv_path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file, lineterminator='\n')
+            writer.writerow(columns)
+            writer.writerows(rows)
+        
+        print(f"Excel file shape: {(len(rows), len(columns))} (rows, columns)")
+        print(f"Column names: {columns}")
         print(f"Successfully converted to CSV: {output_csv_path}")
         
         # Show first few rows
         print("\nFirst 5 rows of data:")
-        print(df.head())
+        print(pd.DataFrame(rows[:5], columns=columns))
         
         return True
         
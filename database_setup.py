@@ -8,15 +8,35 @@ import pandas as pd
 import re
 from datetime import datetime
 import os
+from pathlib import Path
+
+# Player status indicators such as "(Q)" or "(R)", with any leading whitespace
+_STATUS_RE = re.compile(r'\s*\(([QIRSP]+)\)')
+# "Last, First TEAM POS" once status indicators are removed; the last name is
+# everything up to the final ", " just like the split-based fallback
+_PLAYER_RE = re.compile(r'^(?P<last_name>.+), (?P<first_name>.*?) (?P<nfl_team>[^ ]+) (?P<position>[^ ]+)$')
 
 class FantasyFootballDB:
-    def __init__(self, db_path="fantasy_draft.db"):
+    def __init__(self, db_path="fantasy_draft.db", verbose=False):
         self.db_path = db_path
+        self.verbose = verbose
         self.conn = None
     
-    def connect(self):
+    def connect(self, bulk_load=False, check_same_thread=True, read_only=False):
         """Connect to SQLite database"""
-        self.conn = sqlite3.connect(self.db_path)
+        if read_only:
+            # Readers never write to the file or leave journal files behind
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+        
+        if bulk_load:
+            # One-shot imports skip the per-commit fsyncs
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-64000")
         return self.conn
     
     def close(self):
@@ -79,8 +99,26 @@ class FantasyFootballDB:
         """)
         
         self.conn.commit()
+        self.create_indexes()
         print("✅ Database tables created successfully!")
     
+    def create_indexes(self):
+        """Create the indexes behind the dashboard queries and refresh planner stats"""
+        cursor = self.conn.cursor()
+        
+        # Picks by round, picks by team (covering round/player for the team
+        # breakdowns), the player join, and players by position. Picks by
+        # draft are already covered by the UNIQUE(draft_id, overall_pick) index
+        # and player name lookups by the players UNIQUE index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_picks_round ON draft_picks (round_number)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_picks_team ON draft_picks (team_id, round_number, player_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_dp_player ON draft_picks (player_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_pos ON players (position, player_id)")
+        
+        # Without statistics the planner may ignore the new indexes
+        cursor.execute("ANALYZE")
+        self.conn.commit()
+    
     def parse_player_string(self, player_string):
         """Parse player string to extract components"""
         # Example: "Lamb, CeeDee DAL WR (Q)"
@@ -91,11 +129,22 @@ class FantasyFootballDB:
         player_string = player_string.strip('"')
         
         # Extract all status indicators (Q, I, R, etc.) if present
-        status_matches = re.findall(r'\(([QIRSP]+)\)', player_string)
+        status_matches = _STATUS_RE.findall(player_string)
         status = ' '.join(status_matches) if status_matches else None
         
         # Remove all status indicators from string
-        player_string = re.sub(r'\s*\([QIRSP]+\)', '', player_string)
+        player_string = _STATUS_RE.sub('', player_string)
+        
+        # Common case: parse the whole string in one match
+        match = _PLAYER_RE.match(player_string)
+        if match:
+            return {
+                'first_name': match['first_name'].strip(),
+                'last_name': match['last_name'].strip(),
+                'nfl_team': match['nfl_team'].strip(),
+                'position': match['position'].strip(),
+                'status': status
+            }
         
         # Split by last space to separate position
         parts = player_string.rsplit(' ', 1)
@@ -152,25 +201,23 @@ class FantasyFootballDB:
     
     def insert_team(self, team_name):
         """Insert team and return team_id"""
+        # The no-op DO UPDATE makes RETURNING fire for existing rows too
         cursor = self.conn.cursor()
         cursor.execute("""
-            INSERT OR IGNORE INTO teams (team_name) VALUES (?)
+            INSERT INTO teams (team_name) VALUES (?)
+            ON CONFLICT (team_name) DO UPDATE SET team_name = excluded.team_name
+            RETURNING team_id
         """, (team_name,))
-        
-        cursor.execute("SELECT team_id FROM teams WHERE team_name = ?", (team_name,))
         return cursor.fetchone()[0]
     
     def insert_player(self, first_name, last_name, nfl_team, position):
         """Insert player and return player_id"""
         cursor = self.conn.cursor()
         cursor.execute("""
-            INSERT OR IGNORE INTO players (first_name, last_name, nfl_team, position)
+            INSERT INTO players (first_name, last_name, nfl_team, position)
             VALUES (?, ?, ?, ?)
-        """, (first_name, last_name, nfl_team, position))
-        
-        cursor.execute("""
-            SELECT player_id FROM players 
-            WHERE first_name = ? AND last_name = ? AND nfl_team = ? AND position = ?
+            ON CONFLICT (first_name, last_name, nfl_team, position) DO UPDATE SET position = excluded.position
+            RETURNING player_id
         """, (first_name, last_name, nfl_team, position))
         return cursor.fetchone()[0]
     
@@ -178,11 +225,10 @@ class FantasyFootballDB:
         """Insert draft and return draft_id"""
         cursor = self.conn.cursor()
         cursor.execute("""
-            INSERT OR IGNORE INTO drafts (year, league_name) VALUES (?, ?)
+            INSERT INTO drafts (year, league_name) VALUES (?, ?)
+            ON CONFLICT (year, league_name) DO UPDATE SET year = excluded.year
+            RETURNING draft_id
         """, (year, league_name))
-        
-        cursor.execute("SELECT draft_id FROM drafts WHERE year = ? AND league_name = ?", 
-                      (year, league_name))
         return cursor.fetchone()[0]
     
     def import_csv_data(self, csv_file):
@@ -197,13 +243,27 @@ class FantasyFootballDB:
         error_count = 0
         skipped_count = 0
         
-        for index, row in df.iterrows():
+        league_name = "La Resistance"
+        drafts = {}
+        teams = {}
+        players = {}
+        pick_rows = []
+        
+        # Pull the columns out as plain arrays up front rather than building
+        # a Series for every row
+        years = df.iloc[:, 0].to_numpy()
+        pick_numbers = df.iloc[:, 1].to_numpy()
+        overall_picks = df.iloc[:, 2].to_numpy()
+        team_names = df.iloc[:, 3].to_numpy()
+        player_strings = df.iloc[:, 4].to_numpy()
+        
+        for index in range(len(df)):
             try:
-                year = int(row.iloc[0])
-                pick_number = str(row.iloc[1])
-                overall_pick = int(row.iloc[2])
-                team_name = str(row.iloc[3])
-                player_string = str(row.iloc[4])
+                year = int(years[index])
+                pick_number = str(pick_numbers[index])
+                overall_pick = int(overall_picks[index])
+                team_name = str(team_names[index])
+                player_string = str(player_strings[index])
                 
                 # Skip "No Pick Made" entries
                 if player_string.strip().lower() in ['no pick made', 'no pick', 'timer']:
@@ -224,36 +284,64 @@ class FantasyFootballDB:
                     error_count += 1
                     continue
                 
-                # Insert/get IDs
-                draft_id = self.insert_draft(year)
-                team_id = self.insert_team(team_name)
-                player_id = self.insert_player(
+                # Queue the pick; teams, players and drafts are de-duplicated
+                # here and inserted in bulk once every row has been parsed
+                player_key = (
                     player_info['first_name'],
                     player_info['last_name'],
                     player_info['nfl_team'],
                     player_info['position']
                 )
-                
-                # Insert draft pick
-                cursor = self.conn.cursor()
-                cursor.execute("""
-                    INSERT OR IGNORE INTO draft_picks 
-                    (draft_id, team_id, player_id, round_number, pick_in_round, 
-                     overall_pick, player_status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (draft_id, team_id, player_id, round_num, pick_in_round, 
-                      overall_pick, player_info['status']))
+                drafts.setdefault(year, None)
+                teams.setdefault(team_name, None)
+                players.setdefault(player_key, None)
+                pick_rows.append((year, team_name, player_key, round_num, pick_in_round,
+                                  overall_pick, player_info['status']))
                 
                 imported_count += 1
                 
-                if imported_count % 100 == 0:
-                    print(f"Imported {imported_count} picks...")
+                if self.verbose and imported_count % 100 == 0:
+                    print(f"Parsed {imported_count} picks...")
                     
             except Exception as e:
                 print(f"Error processing row {index}: {e}")
                 error_count += 1
         
-        self.conn.commit()
+        # Insert everything in a single transaction
+        with self.conn:
+            cursor = self.conn.cursor()
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO drafts (year, league_name) VALUES (?, ?)
+            """, [(year, league_name) for year in drafts])
+            cursor.executemany("""
+                INSERT OR IGNORE INTO teams (team_name) VALUES (?)
+            """, [(team_name,) for team_name in teams])
+            cursor.executemany("""
+                INSERT OR IGNORE INTO players (first_name, last_name, nfl_team, position)
+                VALUES (?, ?, ?, ?)
+            """, list(players))
+            
+            # Look up the IDs for everything referenced by the picks
+            cursor.execute("SELECT year, draft_id FROM drafts WHERE league_name = ?", (league_name,))
+            drafts.update(cursor.fetchall())
+            cursor.execute("SELECT team_name, team_id FROM teams")
+            teams.update(cursor.fetchall())
+            cursor.execute("""
+                SELECT first_name, last_name, nfl_team, position, player_id FROM players
+            """)
+            players.update((row[:4], row[4]) for row in cursor.fetchall())
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO draft_picks 
+                (draft_id, team_id, player_id, round_number, pick_in_round, 
+                 overall_pick, player_status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(drafts[year], teams[team_name], players[player_key], round_num,
+                   pick_in_round, overall_pick, status)
+                  for year, team_name, player_key, round_num, pick_in_round, overall_pick, status
+                  in pick_rows])
+        
         print(f"✅ Import complete! {imported_count} picks imported, {skipped_count} skipped (no pick made), {error_count} errors")
         return imported_count, error_count
 
@@ -261,7 +349,7 @@ def main():
     """Main function to set up database and import data"""
     # Initialize database
     db = FantasyFootballDB()
-    db.connect()
+    db.connect(bulk_load=True)
     
     # Create tables
     db.create_tables()
@@ -273,6 +361,12 @@ def main():
     else:
         print(f"❌ CSV file not found: {csv_file}")
     
+    # Refresh planner statistics now that the tables are populated
+    db.create_indexes()
+    
+    # Back to a rollback journal so read-only connections need no -wal/-shm files
+    db.conn.execute("PRAGMA journal_mode=DELETE")
+    
     # Show some stats
     cursor = db.conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM draft_picks")
@@ -5,9 +5,13 @@ Fantasy Football Draft Analysis - Streamlit Dashboard
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import sqlite3
+import os
+from types import SimpleNamespace
 from database_setup import FantasyFootballDB
 
 # Page config
@@ -18,56 +22,220 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Databases smaller than this are served from an in-memory copy
+IN_MEMORY_DB_BYTES = 50_000_000
+
 # Database connection
 @st.cache_resource
 def get_database():
     db = FantasyFootballDB()
-    db.connect()
+    # Streamlit reruns the script on a fresh thread, so the cached
+    # connection has to be shareable across threads
+    db.connect(check_same_thread=False, read_only=True)
+    
+    # The dashboard only reads, so a small database is copied into memory
+    # once; larger ones are memory-mapped instead
+    if os.path.getsize(db.db_path) < IN_MEMORY_DB_BYTES:
+        mem_conn = sqlite3.connect(":memory:", check_same_thread=False)
+        db.conn.backup(mem_conn)
+        db.close()
+        db.conn = mem_conn
+    else:
+        db.conn.execute("PRAGMA mmap_size=268435456")
     return db
 
+def _filter_clause(years, positions, teams):
+    """Build a parameterized WHERE clause for the selected filters"""
+    conditions = []
+    params = []
+    for column, values in (("d.year", years), ("p.position", positions), ("t.team_name", teams)):
+        if values:
+            conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+    
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
 # Data loading functions
 @st.cache_data
-def load_draft_data():
-    """Load all draft data"""
+def load_filter_options():
+    """Load the distinct years, positions and teams that have picks"""
     db = get_database()
-    query = """
+    # Read the small dimension tables and probe draft_picks through its
+    # indexes, rather than joining every pick
+    years = [row[0] for row in db.conn.execute("""
+        SELECT DISTINCT d.year FROM drafts d
+        WHERE EXISTS (SELECT 1 FROM draft_picks dp WHERE dp.draft_id = d.draft_id)
+        ORDER BY d.year DESC
+    """)]
+    positions = [row[0] for row in db.conn.execute("""
+        SELECT DISTINCT p.position FROM players p
+        WHERE EXISTS (SELECT 1 FROM draft_picks dp WHERE dp.player_id = p.player_id)
+        ORDER BY p.position
+    """)]
+    teams = [row[0] for row in db.conn.execute("""
+        SELECT t.team_name FROM teams t
+        WHERE EXISTS (SELECT 1 FROM draft_picks dp WHERE dp.team_id = t.team_id)
+        ORDER BY t.team_name
+    """)]
+    return years, positions, teams
+
+@st.cache_data
+def load_draft_data(years: tuple, positions: tuple, teams: tuple):
+    """Load draft data for the selected years, positions and teams (empty means all)"""
+    db = get_database()
+    where, params = _filter_clause(years, positions, teams)
+    query = f"""
     SELECT 
         dp.overall_pick,
         dp.round_number,
-        dp.pick_in_round,
         d.year,
         t.team_name,
         p.first_name,
         p.last_name,
         p.nfl_team,
-        p.position,
-        dp.player_status
+        p.position
     FROM draft_picks dp
     JOIN drafts d ON dp.draft_id = d.draft_id
     JOIN teams t ON dp.team_id = t.team_id
     JOIN players p ON dp.player_id = p.player_id
+    {where}
     ORDER BY d.year, dp.overall_pick
     """
-    return pd.read_sql_query(query, db.conn)
+    df = pd.read_sql_query(query, db.conn, params=params)
+    
+    # Repeated labels as categories and narrow integer columns keep the
+    # frame small and make filters/groupbys compare integer codes
+    for col in ('position', 'team_name', 'nfl_team'):
+        df[col] = df[col].astype('category')
+    return df.astype({'year': 'int16', 'round_number': 'int8', 'overall_pick': 'int16'})
+
+@st.cache_data
+def load_player_lookup_data():
+    """Load every pick with a lowercase full name column for searching"""
+    df = load_draft_data((), (), ())
+    return df.assign(_full_lower=(df['first_name'].fillna('') + ' ' + df['last_name'].fillna('')).str.lower())
 
 @st.cache_data
-def load_position_analysis():
-    """Load position-based analysis data"""
+def sort_picks_desc(df):
+    """Sort picks latest first once per frame, keeping ties in year order"""
+    return df.sort_values('overall_pick', ascending=False, kind='stable')
+
+@st.cache_data
+def load_position_analysis(years: tuple, positions: tuple, teams: tuple):
+    """Load position-based analysis data for the selected filters"""
     db = get_database()
-    query = """
+    where, params = _filter_clause(years, positions, teams)
+    query = f"""
     SELECT 
         p.position,
         dp.round_number,
         COUNT(*) as picks_count,
         AVG(dp.overall_pick) as avg_pick,
         MIN(dp.overall_pick) as earliest_pick,
-        MAX(dp.overall_pick) as latest_pick
+        MAX(dp.overall_pick) as latest_pick,
+        MIN(d.year * 10000 + dp.overall_pick) as first_pick_key
     FROM draft_picks dp
+    JOIN drafts d ON dp.draft_id = d.draft_id
+    JOIN teams t ON dp.team_id = t.team_id
     JOIN players p ON dp.player_id = p.player_id
+    {where}
     GROUP BY p.position, dp.round_number
     ORDER BY dp.round_number, picks_count DESC
     """
-    return pd.read_sql_query(query, db.conn)
+    return pd.read_sql_query(query, db.conn, params=params)
+
+@st.cache_data
+def load_draft_meta(years: tuple, positions: tuple, teams: tuple):
+    """Load the positions, teams, last round, last pick and number of years for the selected filters"""
+    db = get_database()
+    where, params = _filter_clause(years, positions, teams)
+    query = f"""
+    SELECT 
+        COUNT(DISTINCT d.year),
+        MAX(dp.round_number),
+        MAX(dp.overall_pick)
+    FROM draft_picks dp
+    JOIN drafts d ON dp.draft_id = d.draft_id
+    JOIN teams t ON dp.team_id = t.team_id
+    JOIN players p ON dp.player_id = p.player_id
+    {where}
+    """
+    years_in_data, max_round, max_pick = db.conn.execute(query, params).fetchone()
+    all_positions, _ = load_round_matrix(years, positions, teams)
+    team_query = f"""
+    SELECT DISTINCT t.team_name
+    FROM draft_picks dp
+    JOIN drafts d ON dp.draft_id = d.draft_id
+    JOIN teams t ON dp.team_id = t.team_id
+    JOIN players p ON dp.player_id = p.player_id
+    {where}
+    ORDER BY t.team_name
+    """
+    all_teams = [row[0] for row in db.conn.execute(team_query, params)]
+    return SimpleNamespace(
+        positions=tuple(all_positions),
+        teams=tuple(all_teams),
+        max_round=max_round or 0,
+        max_pick=max_pick or 0,
+        years_in_data=years_in_data
+    )
+
+@st.cache_data
+def load_round_matrix(years: tuple, positions: tuple, teams: tuple):
+    """Load pick counts as a (round, position) matrix, row i holding round i"""
+    position_round = load_position_analysis(years, positions, teams)
+    all_positions = sorted(position_round['position'].unique())
+    max_round = position_round['round_number'].max() if not position_round.empty else 0
+    
+    counts = np.zeros((max_round + 1, len(all_positions)), dtype='int32')
+    counts[position_round['round_number'], np.searchsorted(all_positions, position_round['position'])] = position_round['picks_count']
+    return all_positions, counts
+
+@st.cache_data
+def load_round_first_picks(years: tuple, positions: tuple, teams: tuple):
+    """Load when each position was first picked in each round, as year * 10000 + pick keys in the round matrix shape"""
+    position_round = load_position_analysis(years, positions, teams)
+    all_positions, counts = load_round_matrix(years, positions, teams)
+    
+    first_picks = np.full(counts.shape, np.iinfo('int64').max)
+    first_picks[position_round['round_number'], np.searchsorted(all_positions, position_round['position'])] = position_round['first_pick_key']
+    return first_picks
+
+def most_picked_position(counts, first_picks):
+    """Index of the most picked position, ties going to the position picked first like value_counts"""
+    return np.lexsort((first_picks, -counts))[0]
+
+@st.cache_data
+def load_pick_matrix(years: tuple, positions: tuple, teams: tuple):
+    """Load cumulative pick counts as a (pick, position) matrix, row i holding picks 1 through i,
+    and when each position was first taken at each pick as year * 10000 + pick keys"""
+    db = get_database()
+    where, params = _filter_clause(years, positions, teams)
+    query = f"""
+    SELECT 
+        dp.overall_pick,
+        p.position,
+        COUNT(*) as picks_count,
+        MIN(d.year) as first_year
+    FROM draft_picks dp
+    JOIN drafts d ON dp.draft_id = d.draft_id
+    JOIN teams t ON dp.team_id = t.team_id
+    JOIN players p ON dp.player_id = p.player_id
+    {where}
+    GROUP BY dp.overall_pick, p.position
+    """
+    pick_position = pd.read_sql_query(query, db.conn, params=params)
+    all_positions, _ = load_round_matrix(years, positions, teams)
+    max_pick = pick_position['overall_pick'].max() if not pick_position.empty else 0
+    
+    rows = pick_position['overall_pick']
+    cols = np.searchsorted(all_positions, pick_position['position'])
+    counts = np.zeros((max_pick + 1, len(all_positions)), dtype='int32')
+    counts[rows, cols] = pick_position['picks_count']
+    first_picks = np.full(counts.shape, np.iinfo('int64').max)
+    first_picks[rows, cols] = pick_position['first_year'] * 10000 + rows
+    return all_positions, counts.cumsum(axis=0), first_picks
 
 @st.cache_data
 def load_team_analysis():
@@ -88,16 +256,297 @@ def load_team_analysis():
     """
     return pd.read_sql_query(query, db.conn)
 
+# Heat map colors, from zero picks up to the most picked position
+PALETTE = np.array(["#f0f0f0", "#e3f2fd", "#bbdefb", "#90caf9", "#42a5f5", "#1976d2"])
+THRESHOLDS = np.array([0, 0.2, 0.4, 0.6, 0.8])
+
+@st.cache_data
+def position_grid_html(positions, labels, intensities):
+    """Build the position heat map as a single CSS grid"""
+    # Zero is gray and each band includes its upper bound, so search left
+    intensities = np.asarray(intensities, dtype=float)
+    colors = PALETTE[np.searchsorted(THRESHOLDS, intensities, side='left')]
+    text_colors = np.where(intensities > 0.6, 'white', 'black')
+    cells = ''.join(
+        f'<div style="background-color: {color}; padding: 10px; border-radius: 8px; '
+        f'text-align: center; border: 1px solid #ddd;">'
+        f'<strong style="color: {text_color};">{pos}</strong><br>'
+        f'<span style="color: {text_color};">{label}</span></div>'
+        for pos, label, color, text_color in zip(positions, labels, colors, text_colors)
+    )
+    return f'<div style="display: grid; grid-template-columns: repeat({len(positions)}, 1fr); gap: 4px;">{cells}</div>'
+
+@st.cache_data
+def build_scarcity_table(all_positions, taken_counts, remaining_counts, years_in_data):
+    """Build the position scarcity table from taken and remaining counts per position"""
+    total_counts = taken_counts + remaining_counts
+    pct_taken = np.divide(taken_counts, total_counts, out=np.zeros(len(all_positions)), where=total_counts > 0) * 100
+    
+    if years_in_data > 1:
+        # Show averages per year when multiple years selected
+        return pd.DataFrame({
+            'Position': all_positions,
+            'Taken (Avg/Year)': np.round(taken_counts / years_in_data, 1),
+            'Remaining (Avg/Year)': np.round(remaining_counts / years_in_data, 1),
+            'Total (Avg/Year)': np.round(total_counts / years_in_data, 1),
+            '% Taken': np.round(pct_taken, 1)
+        })
+    # Show totals when single year selected
+    return pd.DataFrame({
+        'Position': all_positions,
+        'Taken': taken_counts,
+        'Remaining': remaining_counts,
+        'Total': total_counts,
+        '% Taken': np.round(pct_taken, 1)
+    })
+
+@st.cache_data
+def table_html(df, percent_cols=()):
+    """Render a small read-only table as static HTML, skipping the interactive grid"""
+    formatters = {col: '{:.1f}%'.format for col in percent_cols}
+    return df.to_html(index=False, border=0, formatters=formatters)
+
+def scarcity_list_markdown(title, rows, years_in_data):
+    """Build a titled bullet list of (position, % taken, remaining) rows as one markdown block"""
+    if years_in_data > 1:
+        lines = [f"• **{pos}**: {taken:.1f}% taken ({remaining:.1f} left)" for pos, taken, remaining in rows]
+    else:
+        lines = [f"• **{pos}**: {taken:.1f}% taken ({remaining} left)" for pos, taken, remaining in rows]
+    # Hard line breaks keep each bullet on its own line
+    return "  \n".join([title] + lines)
+
+# Scarcity scatter switches to WebGL above this many points, and to
+# binned markers above the second limit
+SCATTER_WEBGL_POINTS = 500
+SCATTER_BIN_POINTS = 5000
+
+# Player history lines are downsampled above this many points
+PLAYER_CHART_POINTS = 200
+
+def downsample_lttb(x, y, n_out):
+    """Pick n_out point indices by largest-triangle-three-buckets, keeping the first and last"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # Interior points are split into n_out - 2 buckets, and each bucket keeps
+    # the point forming the largest triangle with the previous pick and the
+    # next bucket's average
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[end:edges[i + 2]].mean(), y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        prev = indices[i]
+        areas = np.abs(
+            (x[prev] - next_x) * (y[start:end] - y[prev]) -
+            (x[prev] - x[start:end]) * (next_y - y[prev])
+        )
+        indices[i + 1] = start + areas.argmax()
+    return indices
+
+# Cached figure builders - take small aggregated frames so reruns with the
+# same data skip figure construction
+@st.cache_data
+def build_heatmap_fig(all_positions, round_counts):
+    """Build the position by round heatmap from the round matrix"""
+    fig_heatmap = px.imshow(
+        round_counts[1:].T,
+        x=[f"Round {i}" for i in range(1, len(round_counts))],
+        y=all_positions,
+        title="Position Selection Heatmap",
+        color_continuous_scale="Viridis",
+        text_auto=True,  # Add numbers to each cell
+        aspect="auto"    # Better spacing
+    )
+
+    # Improve layout and readability
+    fig_heatmap.update_layout(
+        font=dict(size=11),
+        title_font_size=16,
+        xaxis_title="Draft Round",
+        yaxis_title="Position",
+        coloraxis_colorbar=dict(
+            title="Number of Picks",
+            title_font_size=12
+        )
+    )
+
+    # Make text more readable
+    fig_heatmap.update_traces(
+        textfont_size=11,
+        textfont_color="white"  # White text for better contrast
+    )
+    return fig_heatmap
+
+@st.cache_data
+def build_adp_fig(adp_df):
+    """Build the average draft position bar chart"""
+    return px.bar(
+        adp_df,
+        x='Position',
+        y='Average_Pick',
+        error_y='Std_Dev',
+        title="Average Draft Position by Position",
+        labels={'Position': 'Position', 'Average_Pick': 'Average Pick Number'}
+    )
+
+@st.cache_data
+def build_scarcity_scatter_fig(scarcity_df):
+    """Build the position draft patterns scatter plot"""
+    labels = {
+        'Overall_Pick': 'Overall Draft Pick', 
+        'Position_Rank': 'Position Rank (1st, 2nd, 3rd of that position)',
+        'Position': 'Position'
+    }
+    
+    if len(scarcity_df) > SCATTER_BIN_POINTS:
+        # Too many markers to draw one per pick - plot 5x5 pick/rank bins
+        # at their centers, sized by the number of picks in each
+        binned = scarcity_df.assign(
+            Overall_Pick=scarcity_df['Overall_Pick'] // 5 * 5 + 2,
+            Position_Rank=scarcity_df['Position_Rank'] // 5 * 5 + 2
+        ).groupby(['Position', 'Overall_Pick', 'Position_Rank'], observed=True).size().reset_index(name='Picks')
+        fig_scarcity = px.scatter(
+            binned,
+            x='Overall_Pick',
+            y='Position_Rank',
+            color='Position',
+            size='Picks',
+            title="Position Draft Patterns - When Each Position Gets Picked",
+            labels=labels,
+            render_mode='webgl'
+        )
+    else:
+        fig_scarcity = px.scatter(
+            scarcity_df,
+            x='Overall_Pick',
+            y='Position_Rank',
+            color='Position',
+            title="Position Draft Patterns - When Each Position Gets Picked",
+            labels=labels,
+            hover_data=['Player', 'Year'],
+            render_mode='webgl' if len(scarcity_df) > SCATTER_WEBGL_POINTS else 'svg'
+        )
+
+    fig_scarcity.update_layout(
+        xaxis_title="Overall Draft Pick",
+        yaxis_title="Position Rank (1st, 2nd, 3rd... of position)",
+        legend_title="Position"
+    )
+    return fig_scarcity
+
+@st.cache_data
+def build_position_bar_fig(pos_data, y_col, title, y_label):
+    """Build a per-position bar chart of picks"""
+    # One color per position, cycling the active template's colorway like px's color=
+    palette = pio.templates[pio.templates.default].layout.colorway
+    colors = [palette[i % len(palette)] for i in range(len(pos_data))]
+    fig = go.Figure(go.Bar(
+        x=pos_data['Position'].to_numpy(),
+        y=pos_data[y_col].to_numpy(),
+        marker_color=colors
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Position',
+        yaxis_title=y_label,
+        height=300,
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data
+def build_availability_fig(scarcity_df, y_cols, color_map, y_label, title):
+    """Build the taken vs remaining bar chart"""
+    positions = scarcity_df['Position'].to_numpy()
+    fig = go.Figure([
+        go.Bar(x=positions, y=scarcity_df[col].to_numpy(), name=col, marker_color=color_map[col])
+        for col in y_cols
+    ])
+    fig.update_layout(
+        title=title,
+        barmode='relative',  # Stack taken and remaining
+        xaxis_title='Position',
+        yaxis_title=y_label,
+        legend_title='Status',
+        height=400
+    )
+    return fig
+
+@st.cache_data
+def build_team_comparison_fig(team_comparison_pivot):
+    """Build the team by position average picks heatmap"""
+    # Create heatmap with text annotations
+    fig_comparison = go.Figure(go.Heatmap(
+        z=team_comparison_pivot.values,
+        x=list(team_comparison_pivot.columns),
+        y=list(team_comparison_pivot.index),
+        colorscale="Viridis",
+        texttemplate="%{z}",  # Numbers in each cell
+        textfont=dict(size=12, color="white"),  # White text for better contrast
+        colorbar=dict(
+            title=dict(text="Avg Picks Per Year", font_size=12)
+        )
+    ))
+    
+    # Improve layout and spacing
+    fig_comparison.update_layout(
+        title="Team Position Preferences Comparison (Avg Picks Per Year)",
+        height=600,  # Make it taller for better spacing
+        font=dict(size=12),  # Larger font for readability
+        title_font_size=16,
+        xaxis_title="Position",
+        yaxis_title="Team",
+        yaxis_autorange="reversed"  # First team at the top
+    )
+    return fig_comparison
+
+@st.cache_data
+def build_count_bar_fig(data, x, y, title, orientation='v'):
+    """Build a plain bar chart of pick counts"""
+    fig = go.Figure(go.Bar(
+        x=data[x].to_numpy(),
+        y=data[y].to_numpy(),
+        orientation=orientation
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+@st.cache_data
+def build_player_fig(player_data, title):
+    """Build a player's draft position over time line chart"""
+    if len(player_data) > PLAYER_CHART_POINTS:
+        keep = downsample_lttb(
+            player_data['year'].to_numpy(dtype=float),
+            player_data['overall_pick'].to_numpy(dtype=float),
+            PLAYER_CHART_POINTS
+        )
+        player_data = player_data.iloc[keep]
+    
+    # WebGL trace keeps long histories off the SVG renderer
+    fig = go.Figure(go.Scattergl(
+        x=player_data['year'].to_numpy(),
+        y=player_data['overall_pick'].to_numpy(),
+        mode='lines+markers'
+    ))
+    fig.update_layout(title=title, xaxis_title='year', yaxis_title='overall_pick')
+    return fig
+
 # Main app
 def main():
     # Title and header
     st.title("🏈 La Resistance Fantasy Football Draft Analysis")
     st.markdown("### Analyze draft patterns, strategies, and trends")
     
-    # Load data
-    df = load_draft_data()
+    # Load filter options
+    years, positions, teams = load_filter_options()
     
-    if df.empty:
+    if not years:
         st.error("No draft data found! Please run database_setup.py first.")
         return
     
@@ -110,30 +559,19 @@ def main():
     
     with col1:
         # Year filter
-        years = sorted(df['year'].unique(), reverse=True)
         selected_years = st.multiselect("📅 Select Years", years, default=[], placeholder="Filter Years")
     
     with col2:
         # Position filter
-        positions = sorted(df['position'].unique())
         selected_positions = st.multiselect("🏈 Select Positions", positions, default=[], placeholder="Filter Positions")
     
     with col3:
         # Team filter
-        teams = sorted(df['team_name'].unique())
         selected_teams = st.multiselect("👥 Select Teams", teams, default=[], placeholder="Filter Teams")
     
-    # Filter data - if nothing selected, show all data
-    filtered_df = df.copy()
-    
-    if selected_years:
-        filtered_df = filtered_df[filtered_df['year'].isin(selected_years)]
-    
-    if selected_positions:
-        filtered_df = filtered_df[filtered_df['position'].isin(selected_positions)]
-    
-    if selected_teams:
-        filtered_df = filtered_df[filtered_df['team_name'].isin(selected_teams)]
+    # Filter data in SQL - if nothing selected, show all data
+    filters = (tuple(selected_years), tuple(selected_positions), tuple(selected_teams))
+    filtered_df = load_draft_data(*filters)
     
     # Show filter status right below filters
     if not selected_years and not selected_positions and not selected_teams:
@@ -157,27 +595,39 @@ def main():
                 filters_applied.append(f"{len(selected_teams)} Team(s)")
         st.info(f"🔍 **Filtered by: {', '.join(filters_applied)}** • Clear selections above to see all data")
     
-    # Main dashboard tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎯 Position Analysis", "📊 Round Analysis", "🔢 Pick Analysis", "👥 Team Analysis", "🔍 Player Lookup"])
+    # Main dashboard tabs - switching tabs reruns the app and only the open
+    # tab is rendered
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["🎯 Position Analysis", "📊 Round Analysis", "🔢 Pick Analysis", "👥 Team Analysis", "🔍 Player Lookup"],
+        key="active_tab",
+        on_change="rerun"
+    )
     
     with tab1:
-        position_analysis_tab(filtered_df)
+        if tab1.open:
+            position_analysis_tab(filtered_df, filters)
     
     with tab2:
-        round_analysis_tab(filtered_df)
+        if tab2.open:
+            round_analysis_tab(filtered_df, filters)
     
     with tab3:
-        pick_analysis_tab(filtered_df)
+        if tab3.open:
+            pick_analysis_tab(filtered_df, filters)
     
     with tab4:
-        team_analysis_tab(filtered_df)
+        if tab4.open:
+            team_analysis_tab(filtered_df, filters)
     
     with tab5:
-        player_lookup_tab(df)
+        if tab5.open:
+            player_lookup_tab()
 
 
 
-def position_analysis_tab(df):
+# Fragment so changing the shown positions only reruns this tab
+@st.fragment
+def position_analysis_tab(df, filters):
     """Position analysis tab"""
     st.header("🎯 Position Analysis")
     
@@ -199,43 +649,14 @@ def position_analysis_tab(df):
     # Position by round heatmap
     st.subheader("Position Selection by Round")
     
-    position_round = df.groupby(['round_number', 'position']).size().reset_index(name='count')
-    pivot_data = position_round.pivot(index='position', columns='round_number', values='count').fillna(0)
-    
-    fig_heatmap = px.imshow(
-        pivot_data.values,
-        x=[f"Round {i}" for i in pivot_data.columns],
-        y=pivot_data.index,
-        title="Position Selection Heatmap",
-        color_continuous_scale="Viridis",
-        text_auto=True,  # Add numbers to each cell
-        aspect="auto"    # Better spacing
-    )
-    
-    # Improve layout and readability
-    fig_heatmap.update_layout(
-        font=dict(size=11),
-        title_font_size=16,
-        xaxis_title="Draft Round",
-        yaxis_title="Position",
-        coloraxis_colorbar=dict(
-            title="Number of Picks",
-            title_font_size=12
-        )
-    )
-    
-    # Make text more readable
-    fig_heatmap.update_traces(
-        textfont_size=11,
-        textfont_color="white"  # White text for better contrast
-    )
-    
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    all_positions, round_counts = load_round_matrix(*filters)
+    fig_heatmap = build_heatmap_fig(all_positions, round_counts)
+    st.plotly_chart(fig_heatmap, width="stretch", key="position_heatmap")
     
     # Average draft position by position
     st.subheader("Average Draft Position (ADP) by Position")
     
-    adp_data = df.groupby('position')['overall_pick'].agg(['mean', 'std', 'min', 'max']).round(1)
+    adp_data = df.groupby('position', observed=True)['overall_pick'].agg(['mean', 'std', 'min', 'max']).round(1)
     adp_data = adp_data.sort_values('mean')
     
     adp_df = pd.DataFrame({
@@ -244,21 +665,14 @@ def position_analysis_tab(df):
         'Std_Dev': adp_data['std']
     })
     
-    fig_adp = px.bar(
-        adp_df,
-        x='Position',
-        y='Average_Pick',
-        error_y='Std_Dev',
-        title="Average Draft Position by Position",
-        labels={'Position': 'Position', 'Average_Pick': 'Average Pick Number'}
-    )
-    st.plotly_chart(fig_adp, use_container_width=True)
+    fig_adp = build_adp_fig(adp_df)
+    st.plotly_chart(fig_adp, width="stretch", key="position_adp")
     
     # Position scarcity analysis - All positions with filtering
     st.subheader("Position Scarcity - Draft Patterns")
     
     # Filter for which positions to show
-    all_positions = sorted(df['position'].unique())
+    all_positions = list(load_draft_meta(*filters).positions)
     selected_positions_scarcity = st.multiselect(
         "Show Positions", 
         all_positions, 
@@ -267,44 +681,20 @@ def position_analysis_tab(df):
     )
     
     if selected_positions_scarcity:
-        # Prepare data for all selected positions
-        scarcity_data = []
-        
-        for pos in selected_positions_scarcity:
-            pos_data = df[df['position'] == pos].sort_values('overall_pick')
-            for rank, (_, row) in enumerate(pos_data.iterrows()):
-                scarcity_data.append({
-                    'Position': pos,
-                    'Overall_Pick': row['overall_pick'],
-                    'Position_Rank': rank + 1,
-                    'Player': f"{row['first_name']} {row['last_name']}",
-                    'Year': row['year']
-                })
-        
-        scarcity_df = pd.DataFrame(scarcity_data)
+        # Rank each pick within its position in one vectorized pass
+        sub = df[df['position'].isin(selected_positions_scarcity)].sort_values(['position', 'overall_pick'], kind='stable')
+        scarcity_df = pd.DataFrame({
+            'Position': sub['position'],
+            'Overall_Pick': sub['overall_pick'],
+            'Position_Rank': sub.groupby('position', observed=True).cumcount() + 1,
+            'Player': sub['first_name'] + ' ' + sub['last_name'],
+            'Year': sub['year']
+        })
         
         # Create scatter plot with all positions
-        fig_scarcity = px.scatter(
-            scarcity_df,
-            x='Overall_Pick',
-            y='Position_Rank',
-            color='Position',
-            title="Position Draft Patterns - When Each Position Gets Picked",
-            labels={
-                'Overall_Pick': 'Overall Draft Pick', 
-                'Position_Rank': 'Position Rank (1st, 2nd, 3rd of that position)',
-                'Position': 'Position'
-            },
-            hover_data=['Player', 'Year']
-        )
+        fig_scarcity = build_scarcity_scatter_fig(scarcity_df)
         
-        fig_scarcity.update_layout(
-            xaxis_title="Overall Draft Pick",
-            yaxis_title="Position Rank (1st, 2nd, 3rd... of position)",
-            legend_title="Position"
-        )
-        
-        st.plotly_chart(fig_scarcity, use_container_width=True)
+        st.plotly_chart(fig_scarcity, width="stretch", key="position_scarcity")
         
         # Position comparison stats
         col1, col2 = st.columns(2)
@@ -324,7 +714,7 @@ def position_analysis_tab(df):
             
             comparison_df = pd.DataFrame(comparison_stats)
             comparison_df = comparison_df.sort_values('Avg Pick')
-            st.dataframe(comparison_df, use_container_width=True)
+            st.dataframe(comparison_df, width="stretch")
         
         with col2:
             st.subheader("Position Scarcity Insights")
@@ -342,13 +732,19 @@ def position_analysis_tab(df):
     else:
         st.info("Select at least one position to see the scarcity analysis.")
 
-def round_analysis_tab(df):
+# Fragment so changing the round only reruns this tab
+@st.fragment
+def round_analysis_tab(df, filters):
     """Round analysis tab for draft strategy"""
     st.header("📊 Round Analysis - Draft Strategy Tool")
     st.markdown("**Analyze what happened in any round and see position scarcity in real-time**")
     
+    # Pick counts per round and position, and constants for the filtered data
+    meta = load_draft_meta(*filters)
+    all_positions, round_counts = load_round_matrix(*filters)
+    
     # Round selector
-    max_round = df['round_number'].max()
+    max_round = meta.max_round
     selected_round = st.selectbox(
         "Select Round to Analyze", 
         range(1, max_round + 1),
@@ -356,74 +752,34 @@ def round_analysis_tab(df):
         help="Choose a round to see what picks were made and analyze position scarcity"
     )
     
-    # Calculate how many years are in the filtered data for averaging
-    years_in_data = df['year'].nunique()
-    
-    # Calculate data for the selected round (using filtered data)
-    round_data = df[df['round_number'] == selected_round].sort_values('overall_pick')
+    # How many years are in the filtered data for averaging
+    years_in_data = meta.years_in_data
     
-    # Data through the selected round (cumulative) - using filtered data
-    data_through_round = df[df['round_number'] <= selected_round]
+    # Position counts for the selected round (using filtered data)
+    round_summary = pd.Series(round_counts[selected_round], index=all_positions)
     
-    # Data remaining after this round - using filtered data
-    data_remaining = df[df['round_number'] > selected_round]
+    # Picks taken through and remaining after the selected round - using filtered data
+    taken_counts = round_counts[:selected_round + 1].sum(axis=0)
+    remaining_counts = round_counts[selected_round + 1:].sum(axis=0)
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Position breakdown for this round (strategy-focused)
         st.subheader(f"📋 Round {selected_round} Position Breakdown")
-        if not round_data.empty:
-            # Position summary
-            round_summary = round_data['position'].value_counts().sort_index()
-            
+        if round_summary.any():
             if years_in_data > 1:
                 # Show averages when multiple years selected
                 st.markdown(f"**Average picks per year (across {years_in_data} years):**")
                 
                 # Create heat map color coding based on pick frequency
-                # Get all possible positions from the full dataset
-                all_positions = sorted(df['position'].unique())
-                max_picks = max(round_summary.values) / years_in_data if len(round_summary) > 0 else 1
+                max_picks = max(round_summary.values) / years_in_data
                 
-                # Create columns for heat map display (always show all positions)
-                cols = st.columns(len(all_positions))
-                
-                for idx, pos in enumerate(all_positions):
-                    count = round_summary.get(pos, 0)  # Get count or 0 if position not picked
-                    avg_picks = count / years_in_data
-                    # Calculate color intensity (0-1 scale)
-                    intensity = avg_picks / max_picks if max_picks > 0 else 0
-                    
-                    # Color scale from light blue to dark red
-                    if intensity == 0:
-                        color = "#f0f0f0"  # Light gray for zero
-                    elif intensity <= 0.2:
-                        color = "#e3f2fd"  # Very light blue
-                    elif intensity <= 0.4:
-                        color = "#bbdefb"  # Light blue
-                    elif intensity <= 0.6:
-                        color = "#90caf9"  # Medium blue
-                    elif intensity <= 0.8:
-                        color = "#42a5f5"  # Dark blue
-                    else:
-                        color = "#1976d2"  # Very dark blue
-                    
-                    # Display in columns with colored background
-                    with cols[idx % 6]:
-                        st.markdown(f"""
-                        <div style="
-                            background-color: {color}; 
-                            padding: 10px; 
-                            border-radius: 8px; 
-                            text-align: center;
-                            margin: 2px;
-                            border: 1px solid #ddd;
-                        ">
-                            <strong style="color: {'white' if intensity > 0.6 else 'black'};">{pos}</strong><br>
-                            <span style="color: {'white' if intensity > 0.6 else 'black'};">{avg_picks:.1f} picks</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Render the heat map as one CSS grid (always show all positions)
+                counts = [round_summary.get(pos, 0) for pos in all_positions]  # 0 if position not picked
+                labels = [f"{count / years_in_data:.1f} picks" for count in counts]
+                intensities = [count / years_in_data / max_picks if max_picks > 0 else 0 for count in counts]
+                st.html(position_grid_html(all_positions, labels, intensities))
                 
 
                     
@@ -432,47 +788,13 @@ def round_analysis_tab(df):
                 st.markdown(f"**Position picks in Round {selected_round}:**")
                 
                 # Create heat map color coding for single year
-                # Get all possible positions from the full dataset
-                all_positions = sorted(df['position'].unique())
-                max_picks = max(round_summary.values) if len(round_summary) > 0 else 1
+                max_picks = max(round_summary.values)
                 
-                # Create columns for heat map display (always show all positions)
-                cols = st.columns(len(all_positions))
-                
-                for idx, pos in enumerate(all_positions):
-                    count = round_summary.get(pos, 0)  # Get count or 0 if position not picked
-                    # Calculate color intensity (0-1 scale)
-                    intensity = count / max_picks if max_picks > 0 else 0
-                    
-                    # Color scale from light blue to dark red
-                    if intensity == 0:
-                        color = "#f0f0f0"  # Light gray for zero
-                    elif intensity <= 0.2:
-                        color = "#e3f2fd"  # Very light blue
-                    elif intensity <= 0.4:
-                        color = "#bbdefb"  # Light blue
-                    elif intensity <= 0.6:
-                        color = "#90caf9"  # Medium blue
-                    elif intensity <= 0.8:
-                        color = "#42a5f5"  # Dark blue
-                    else:
-                        color = "#1976d2"  # Very dark blue
-                    
-                    # Display in columns with colored background
-                    with cols[idx % 6]:
-                        st.markdown(f"""
-                        <div style="
-                            background-color: {color}; 
-                            padding: 10px; 
-                            border-radius: 8px; 
-                            text-align: center;
-                            margin: 2px;
-                            border: 1px solid #ddd;
-                        ">
-                            <strong style="color: {'white' if intensity > 0.6 else 'black'};">{pos}</strong><br>
-                            <span style="color: {'white' if intensity > 0.6 else 'black'};">{count} picks</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Render the heat map as one CSS grid (always show all positions)
+                counts = [round_summary.get(pos, 0) for pos in all_positions]  # 0 if position not picked
+                labels = [f"{count} picks" for count in counts]
+                intensities = [count / max_picks if max_picks > 0 else 0 for count in counts]
+                st.html(position_grid_html(all_positions, labels, intensities))
                 
 
             
@@ -488,14 +810,7 @@ def round_analysis_tab(df):
                     'Position': all_positions,
                     'Avg_Picks_Per_Year': avg_picks_data
                 })
-                fig_round_pos = px.bar(
-                    pos_data,
-                    x='Position',
-                    y='Avg_Picks_Per_Year',
-                    title=f"Round {selected_round} - Avg Picks Per Year",
-                    color='Position',
-                    labels={'Avg_Picks_Per_Year': 'Average Picks Per Year'}
-                )
+                fig_round_pos = build_position_bar_fig(pos_data, 'Avg_Picks_Per_Year', f"Round {selected_round} - Avg Picks Per Year", 'Average Picks Per Year')
             else:
                 # Create data for all positions, including those with 0 picks
                 picks_data = []
@@ -507,17 +822,9 @@ def round_analysis_tab(df):
                     'Position': all_positions,
                     'Picks': picks_data
                 })
-                fig_round_pos = px.bar(
-                    pos_data,
-                    x='Position',
-                    y='Picks',
-                    title=f"Round {selected_round} - Position Picks",
-                    color='Position',
-                    labels={'Picks': 'Number of Picks'}
-                )
+                fig_round_pos = build_position_bar_fig(pos_data, 'Picks', f"Round {selected_round} - Position Picks", 'Number of Picks')
             
-            fig_round_pos.update_layout(height=300, showlegend=False)
-            st.plotly_chart(fig_round_pos, use_container_width=True)
+            st.plotly_chart(fig_round_pos, width="stretch", key="round_positions")
         else:
             st.info(f"No data available for Round {selected_round}")
     
@@ -525,40 +832,8 @@ def round_analysis_tab(df):
         # Strategic insights for the round
         st.subheader(f"🎯 Strategic Insights for Round {selected_round}")
         
-        # We'll calculate scarcity data first for the insights
-        taken_counts = data_through_round['position'].value_counts()
-        remaining_counts = data_remaining['position'].value_counts()
-        
         # Create comprehensive scarcity dataframe
-        all_positions = df['position'].unique()
-        scarcity_data = []
-        
-        for pos in sorted(all_positions):
-            taken = taken_counts.get(pos, 0)
-            remaining = remaining_counts.get(pos, 0)
-            total = taken + remaining
-            pct_taken = (taken / total * 100) if total > 0 else 0
-            
-            if years_in_data > 1:
-                # Show averages per year when multiple years selected
-                scarcity_data.append({
-                    'Position': pos,
-                    'Taken (Avg/Year)': round(taken / years_in_data, 1),
-                    'Remaining (Avg/Year)': round(remaining / years_in_data, 1),
-                    'Total (Avg/Year)': round(total / years_in_data, 1),
-                    '% Taken': f"{pct_taken:.1f}%"
-                })
-            else:
-                # Show totals when single year selected
-                scarcity_data.append({
-                    'Position': pos,
-                    'Taken': taken,
-                    'Remaining': remaining,
-                    'Total': total,
-                    '% Taken': f"{pct_taken:.1f}%"
-                })
-        
-        scarcity_df = pd.DataFrame(scarcity_data)
+        scarcity_df = build_scarcity_table(all_positions, taken_counts, remaining_counts, years_in_data)
         
         # Strategic insights columns
         col1, col2, col3 = st.columns(3)
@@ -569,30 +844,23 @@ def round_analysis_tab(df):
             total_col = 'Total (Avg/Year)' if years_in_data > 1 else 'Total'
             remaining_col = 'Remaining (Avg/Year)' if years_in_data > 1 else 'Remaining'
             
-            scarcity_df_sorted = scarcity_df[scarcity_df[total_col] > 0].copy()
-            scarcity_df_sorted['pct_taken_num'] = scarcity_df_sorted['% Taken'].str.replace('%', '').astype(float)
-            scarcity_df_sorted = scarcity_df_sorted.sort_values('pct_taken_num', ascending=False)
+            scarcity_df_sorted = scarcity_df[scarcity_df[total_col] > 0].sort_values('% Taken', ascending=False)
             
-            st.markdown("**🔥 Most Scarce Positions:**")
-            for _, row in scarcity_df_sorted.head(3).iterrows():
-                remaining_val = row[remaining_col]
-                remaining_text = f"{remaining_val:.1f} left" if years_in_data > 1 else f"{remaining_val} left"
-                st.markdown(f"• **{row['Position']}**: {row['% Taken']} taken ({remaining_text})")
+            rows = scarcity_df_sorted.head(3)[['Position', '% Taken', remaining_col]].to_numpy()
+            st.markdown(scarcity_list_markdown("**🔥 Most Scarce Positions:**", rows, years_in_data))
         
         with col2:
             # Best value positions (lowest % taken)
-            best_value = scarcity_df_sorted.sort_values('pct_taken_num', ascending=True)
-            st.markdown("**💎 Best Value Positions:**")
-            for _, row in best_value.head(3).iterrows():
-                if row['pct_taken_num'] < 100:  # Don't show completely depleted positions
-                    remaining_val = row[remaining_col]
-                    remaining_text = f"{remaining_val:.1f} left" if years_in_data > 1 else f"{remaining_val} left"
-                    st.markdown(f"• **{row['Position']}**: {row['% Taken']} taken ({remaining_text})")
+            best_value = scarcity_df_sorted.sort_values('% Taken', ascending=True)
+            best_value = best_value.head(3)
+            best_value = best_value[best_value['% Taken'] < 100]  # Don't show completely depleted positions
+            rows = best_value[['Position', '% Taken', remaining_col]].to_numpy()
+            st.markdown(scarcity_list_markdown("**💎 Best Value Positions:**", rows, years_in_data))
         
         with col3:
             # Round context
-            total_picks_so_far = len(data_through_round)
-            total_picks_remaining = len(data_remaining)
+            total_picks_so_far = taken_counts.sum()
+            total_picks_remaining = remaining_counts.sum()
             
             st.markdown("**📈 Draft Progress:**")
             if years_in_data > 1:
@@ -603,10 +871,12 @@ def round_analysis_tab(df):
                 st.markdown(f"• **Picks remaining**: {total_picks_remaining}")
             
             if selected_round < max_round:
-                next_round_picks = df[df['round_number'] == selected_round + 1]['position'].value_counts()
-                if not next_round_picks.empty:
-                    top_next_pos = next_round_picks.index[0]
-                    next_count = next_round_picks[top_next_pos]
+                next_round_picks = round_counts[selected_round + 1]
+                if next_round_picks.any():
+                    first_picks = load_round_first_picks(*filters)[selected_round + 1]
+                    top_idx = most_picked_position(next_round_picks, first_picks)
+                    top_next_pos = all_positions[top_idx]
+                    next_count = next_round_picks[top_idx]
                     if years_in_data > 1:
                         st.markdown(f"• **Next round trend**: {next_count / years_in_data:.1f} {top_next_pos}s in Round {selected_round + 1}")
                     else:
@@ -614,7 +884,7 @@ def round_analysis_tab(df):
     
     # Position scarcity table section
     st.subheader(f"📊 Position Scarcity Through Round {selected_round}")
-    st.dataframe(scarcity_df, use_container_width=True, hide_index=True)
+    st.markdown(table_html(scarcity_df, percent_cols=('% Taken',)), unsafe_allow_html=True)
     
     # Visual representation
     if not scarcity_df.empty:
@@ -628,24 +898,22 @@ def round_analysis_tab(df):
             color_map = {'Taken': '#FF6B6B', 'Remaining': '#4ECDC4'}
             y_label = 'Number of Players'
         
-        fig_scarcity = px.bar(
-            scarcity_df,
-            x='Position',
-            y=y_cols,
-            title=f"Position Availability Through Round {selected_round}",
-            color_discrete_map=color_map,
-            labels={'value': y_label, 'variable': 'Status'}
-        )
-        fig_scarcity.update_layout(height=400)
-        st.plotly_chart(fig_scarcity, use_container_width=True)
+        fig_scarcity = build_availability_fig(scarcity_df[['Position'] + y_cols], y_cols, color_map, y_label, f"Position Availability Through Round {selected_round}")
+        st.plotly_chart(fig_scarcity, width="stretch", key="round_availability")
     
-def pick_analysis_tab(df):
+# Fragment so changing the pick only reruns this tab
+@st.fragment
+def pick_analysis_tab(df, filters):
     """Pick analysis tab for draft strategy"""
     st.header("🔢 Pick Analysis - Draft Strategy Tool")
     st.markdown("**Analyze what happened at any pick number and see position scarcity in real-time**")
     
+    # Constants for the filtered data
+    meta = load_draft_meta(*filters)
+    all_positions = meta.positions
+    
     # Pick selector
-    max_pick = df['overall_pick'].max()
+    max_pick = meta.max_pick
     selected_pick = st.selectbox(
         "Select Pick Number to Analyze", 
         range(1, max_pick + 1),
@@ -653,17 +921,16 @@ def pick_analysis_tab(df):
         help="Choose a pick number to see what picks were made and analyze position scarcity"
     )
     
-    # Calculate how many years are in the filtered data for averaging
-    years_in_data = df['year'].nunique()
+    # How many years are in the filtered data for averaging
+    years_in_data = meta.years_in_data
     
     # Calculate data for the selected pick (using filtered data)
     pick_data = df[df['overall_pick'] == selected_pick].sort_values('year')
     
-    # Data through the selected pick (cumulative) - using filtered data
-    data_through_pick = df[df['overall_pick'] <= selected_pick]
-    
-    # Data remaining after this pick - using filtered data
-    data_remaining = df[df['overall_pick'] > selected_pick]
+    # Picks taken through and remaining after the selected pick - using filtered data
+    _, cumulative_counts, first_picks = load_pick_matrix(*filters)
+    taken_counts = cumulative_counts[selected_pick]
+    remaining_counts = cumulative_counts[-1] - taken_counts
     
     col1, col2 = st.columns(2)
     
@@ -678,97 +945,22 @@ def pick_analysis_tab(df):
                 # Show averages when multiple years selected
                 st.markdown(f"**Pick frequency (across {years_in_data} years):**")
                 
-                # Create heat map color coding based on pick frequency
-                # Get all possible positions from the full dataset
-                all_positions = sorted(df['position'].unique())
-                max_picks = max(pick_summary.values) if len(pick_summary) > 0 else 1
-                
-                # Create columns for heat map display (always show all positions)
-                cols = st.columns(len(all_positions))
-                
-                for idx, pos in enumerate(all_positions):
-                    count = pick_summary.get(pos, 0)  # Get count or 0 if position not picked
-                    pick_rate = count / years_in_data * 100
-                    # Calculate color intensity (0-1 scale)
-                    intensity = count / max_picks if max_picks > 0 else 0
-                    
-                    # Color scale from light blue to dark red
-                    if intensity == 0:
-                        color = "#f0f0f0"  # Light gray for zero
-                    elif intensity <= 0.2:
-                        color = "#e3f2fd"  # Very light blue
-                    elif intensity <= 0.4:
-                        color = "#bbdefb"  # Light blue
-                    elif intensity <= 0.6:
-                        color = "#90caf9"  # Medium blue
-                    elif intensity <= 0.8:
-                        color = "#42a5f5"  # Dark blue
-                    else:
-                        color = "#1976d2"  # Very dark blue
-                    
-                    # Display in columns with colored background
-                    with cols[idx % 6]:
-                        st.markdown(f"""
-                        <div style="
-                            background-color: {color}; 
-                            padding: 10px; 
-                            border-radius: 8px; 
-                            text-align: center;
-                            margin: 2px;
-                            border: 1px solid #ddd;
-                        ">
-                            <strong style="color: {'white' if intensity > 0.6 else 'black'};">{pos}</strong><br>
-                            <span style="color: {'white' if intensity > 0.6 else 'black'};">{pick_rate:.0f}%</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Render the heat map as one CSS grid (always show all positions)
+                counts = pick_summary.reindex(all_positions, fill_value=0).to_numpy()  # 0 if position not picked
+                labels = tuple(f"{count / years_in_data * 100:.0f}%" for count in counts)
+                intensities = counts / max(counts.max(), 1)
+                st.html(position_grid_html(all_positions, labels, intensities))
                 
                 
             else:
                 # Show totals when single year selected
                 st.markdown(f"**Position picked at Pick #{selected_pick}:**")
                 
-                # Create heat map color coding for single year
-                # Get all possible positions from the full dataset
-                all_positions = sorted(df['position'].unique())
-                max_picks = max(pick_summary.values) if len(pick_summary) > 0 else 1
-                
-                # Create columns for heat map display (always show all positions)
-                cols = st.columns(len(all_positions))
-                
-                for idx, pos in enumerate(all_positions):
-                    count = pick_summary.get(pos, 0)  # Get count or 0 if position not picked
-                    # Calculate color intensity (0-1 scale)
-                    intensity = count / max_picks if max_picks > 0 else 0
-                    
-                    # Color scale from light blue to dark red
-                    if intensity == 0:
-                        color = "#f0f0f0"  # Light gray for zero
-                    elif intensity <= 0.2:
-                        color = "#e3f2fd"  # Very light blue
-                    elif intensity <= 0.4:
-                        color = "#bbdefb"  # Light blue
-                    elif intensity <= 0.6:
-                        color = "#90caf9"  # Medium blue
-                    elif intensity <= 0.8:
-                        color = "#42a5f5"  # Dark blue
-                    else:
-                        color = "#1976d2"  # Very dark blue
-                    
-                    # Display in columns with colored background
-                    with cols[idx % 6]:
-                        st.markdown(f"""
-                        <div style="
-                            background-color: {color}; 
-                            padding: 10px; 
-                            border-radius: 8px; 
-                            text-align: center;
-                            margin: 2px;
-                            border: 1px solid #ddd;
-                        ">
-                            <strong style="color: {'white' if intensity > 0.6 else 'black'};">{pos}</strong><br>
-                            <span style="color: {'white' if intensity > 0.6 else 'black'};">{'Yes' if count > 0 else 'No'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Render the heat map as one CSS grid (always show all positions)
+                counts = pick_summary.reindex(all_positions, fill_value=0).to_numpy()  # 0 if position not picked
+                labels = tuple(np.where(counts > 0, 'Yes', 'No'))
+                intensities = counts / max(counts.max(), 1)
+                st.html(position_grid_html(all_positions, labels, intensities))
             
             
             # Visual position breakdown
@@ -783,14 +975,7 @@ def pick_analysis_tab(df):
                     'Position': all_positions,
                     'Pick_Rate': pick_rate_data
                 })
-                fig_pick_pos = px.bar(
-                    pos_data,
-                    x='Position',
-                    y='Pick_Rate',
-                    title=f"Pick #{selected_pick} - Position Pick Rate",
-                    color='Position',
-                    labels={'Pick_Rate': 'Pick Rate (%)'}
-                )
+                fig_pick_pos = build_position_bar_fig(pos_data, 'Pick_Rate', f"Pick #{selected_pick} - Position Pick Rate", 'Pick Rate (%)')
             else:
                 # Create data for all positions, including those with 0 picks
                 picks_data = []
@@ -802,17 +987,9 @@ def pick_analysis_tab(df):
                     'Position': all_positions,
                     'Picked': picks_data
                 })
-                fig_pick_pos = px.bar(
-                    pos_data,
-                    x='Position',
-                    y='Picked',
-                    title=f"Pick #{selected_pick} - Position Selection",
-                    color='Position',
-                    labels={'Picked': 'Position Selected (1=Yes, 0=No)'}
-                )
+                fig_pick_pos = build_position_bar_fig(pos_data, 'Picked', f"Pick #{selected_pick} - Position Selection", 'Position Selected (1=Yes, 0=No)')
             
-            fig_pick_pos.update_layout(height=300, showlegend=False)
-            st.plotly_chart(fig_pick_pos, use_container_width=True)
+            st.plotly_chart(fig_pick_pos, width="stretch", key="pick_positions")
             
             # Show specific picks made at this position
             if not pick_data.empty:
@@ -824,7 +1001,7 @@ def pick_analysis_tab(df):
                     'position': 'Position', 
                     'team_name': 'Team'
                 })
-                st.dataframe(pick_details, use_container_width=True, hide_index=True)
+                st.markdown(table_html(pick_details), unsafe_allow_html=True)
         else:
             st.info(f"No data available for Pick #{selected_pick}")
     
@@ -832,40 +1009,8 @@ def pick_analysis_tab(df):
         # Strategic insights for the pick
         st.subheader(f"🎯 Strategic Insights for Pick #{selected_pick}")
         
-        # We'll calculate scarcity data first for the insights
-        taken_counts = data_through_pick['position'].value_counts()
-        remaining_counts = data_remaining['position'].value_counts()
-        
         # Create comprehensive scarcity dataframe
-        all_positions = df['position'].unique()
-        scarcity_data = []
-        
-        for pos in sorted(all_positions):
-            taken = taken_counts.get(pos, 0)
-            remaining = remaining_counts.get(pos, 0)
-            total = taken + remaining
-            pct_taken = (taken / total * 100) if total > 0 else 0
-            
-            if years_in_data > 1:
-                # Show averages per year when multiple years selected
-                scarcity_data.append({
-                    'Position': pos,
-                    'Taken (Avg/Year)': round(taken / years_in_data, 1),
-                    'Remaining (Avg/Year)': round(remaining / years_in_data, 1),
-                    'Total (Avg/Year)': round(total / years_in_data, 1),
-                    '% Taken': f"{pct_taken:.1f}%"
-                })
-            else:
-                # Show totals when single year selected
-                scarcity_data.append({
-                    'Position': pos,
-                    'Taken': taken,
-                    'Remaining': remaining,
-                    'Total': total,
-                    '% Taken': f"{pct_taken:.1f}%"
-                })
-        
-        scarcity_df = pd.DataFrame(scarcity_data)
+        scarcity_df = build_scarcity_table(all_positions, taken_counts, remaining_counts, years_in_data)
         
         # Strategic insights columns
         col1, col2, col3 = st.columns(3)
@@ -876,30 +1021,23 @@ def pick_analysis_tab(df):
             total_col = 'Total (Avg/Year)' if years_in_data > 1 else 'Total'
             remaining_col = 'Remaining (Avg/Year)' if years_in_data > 1 else 'Remaining'
             
-            scarcity_df_sorted = scarcity_df[scarcity_df[total_col] > 0].copy()
-            scarcity_df_sorted['pct_taken_num'] = scarcity_df_sorted['% Taken'].str.replace('%', '').astype(float)
-            scarcity_df_sorted = scarcity_df_sorted.sort_values('pct_taken_num', ascending=False)
+            scarcity_df_sorted = scarcity_df[scarcity_df[total_col] > 0].sort_values('% Taken', ascending=False)
             
-            st.markdown("**🔥 Most Scarce Positions:**")
-            for _, row in scarcity_df_sorted.head(3).iterrows():
-                remaining_val = row[remaining_col]
-                remaining_text = f"{remaining_val:.1f} left" if years_in_data > 1 else f"{remaining_val} left"
-                st.markdown(f"• **{row['Position']}**: {row['% Taken']} taken ({remaining_text})")
+            rows = scarcity_df_sorted.head(3)[['Position', '% Taken', remaining_col]].to_numpy()
+            st.markdown(scarcity_list_markdown("**🔥 Most Scarce Positions:**", rows, years_in_data))
         
         with col2:
             # Best value positions (lowest % taken)
-            best_value = scarcity_df_sorted.sort_values('pct_taken_num', ascending=True)
-            st.markdown("**💎 Best Value Positions:**")
-            for _, row in best_value.head(3).iterrows():
-                if row['pct_taken_num'] < 100:  # Don't show completely depleted positions
-                    remaining_val = row[remaining_col]
-                    remaining_text = f"{remaining_val:.1f} left" if years_in_data > 1 else f"{remaining_val} left"
-                    st.markdown(f"• **{row['Position']}**: {row['% Taken']} taken ({remaining_text})")
+            best_value = scarcity_df_sorted.sort_values('% Taken', ascending=True)
+            best_value = best_value.head(3)
+            best_value = best_value[best_value['% Taken'] < 100]  # Don't show completely depleted positions
+            rows = best_value[['Position', '% Taken', remaining_col]].to_numpy()
+            st.markdown(scarcity_list_markdown("**💎 Best Value Positions:**", rows, years_in_data))
         
         with col3:
             # Pick context
-            total_picks_so_far = len(data_through_pick)
-            total_picks_remaining = len(data_remaining)
+            total_picks_so_far = taken_counts.sum()
+            total_picks_remaining = remaining_counts.sum()
             
             st.markdown("**📈 Draft Progress:**")
             if years_in_data > 1:
@@ -911,20 +1049,21 @@ def pick_analysis_tab(df):
             
             # Show what typically happens at the next few picks
             if selected_pick < max_pick:
-                next_picks_data = df[df['overall_pick'].isin(range(selected_pick + 1, min(selected_pick + 4, max_pick + 1)))]
-                if not next_picks_data.empty:
-                    next_pos_counts = next_picks_data['position'].value_counts()
-                    if not next_pos_counts.empty:
-                        top_next_pos = next_pos_counts.index[0]
-                        next_count = next_pos_counts[top_next_pos]
-                        if years_in_data > 1:
-                            st.markdown(f"• **Next picks trend**: {next_count / years_in_data:.1f} {top_next_pos}s in next 3 picks")
-                        else:
-                            st.markdown(f"• **Next picks trend**: {next_count} {top_next_pos}s in next 3 picks")
+                last_next_pick = min(selected_pick + 3, max_pick)
+                next_picks = cumulative_counts[last_next_pick] - taken_counts
+                if next_picks.any():
+                    next_first_picks = first_picks[selected_pick + 1:last_next_pick + 1].min(axis=0)
+                    top_idx = most_picked_position(next_picks, next_first_picks)
+                    top_next_pos = all_positions[top_idx]
+                    next_count = next_picks[top_idx]
+                    if years_in_data > 1:
+                        st.markdown(f"• **Next picks trend**: {next_count / years_in_data:.1f} {top_next_pos}s in next 3 picks")
+                    else:
+                        st.markdown(f"• **Next picks trend**: {next_count} {top_next_pos}s in next 3 picks")
     
     # Position scarcity table section
     st.subheader(f"📊 Position Scarcity Through Pick #{selected_pick}")
-    st.dataframe(scarcity_df, use_container_width=True, hide_index=True)
+    st.markdown(table_html(scarcity_df, percent_cols=('% Taken',)), unsafe_allow_html=True)
     
     # Visual representation
     if not scarcity_df.empty:
@@ -938,18 +1077,12 @@ def pick_analysis_tab(df):
             color_map = {'Taken': '#FF6B6B', 'Remaining': '#4ECDC4'}
             y_label = 'Number of Players'
         
-        fig_scarcity = px.bar(
-            scarcity_df,
-            x='Position',
-            y=y_cols,
-            title=f"Position Availability Through Pick #{selected_pick}",
-            color_discrete_map=color_map,
-            labels={'value': y_label, 'variable': 'Status'}
-        )
-        fig_scarcity.update_layout(height=400)
-        st.plotly_chart(fig_scarcity, use_container_width=True)
+        fig_scarcity = build_availability_fig(scarcity_df[['Position'] + y_cols], y_cols, color_map, y_label, f"Position Availability Through Pick #{selected_pick}")
+        st.plotly_chart(fig_scarcity, width="stretch", key="pick_availability")
 
-def team_analysis_tab(df):
+# Fragment so changing the team only reruns this tab
+@st.fragment
+def team_analysis_tab(df, filters):
     """Team analysis tab"""
     st.header("👥 Team Analysis")
     
@@ -957,15 +1090,13 @@ def team_analysis_tab(df):
     st.subheader("Team Comparison")
     
     # Calculate averages per year to make fair comparisons
-    team_years = df.groupby('team_name')['year'].nunique().reset_index(name='years_played')
-    team_comparison = df.groupby(['team_name', 'position']).size().reset_index(name='total_picks')
+    years_played = df.groupby('team_name', observed=True)['year'].nunique()
+    total_picks = df.groupby(['team_name', 'position'], observed=True).size()
     
-    # Merge with years played to calculate averages
-    team_comparison = team_comparison.merge(team_years, on='team_name')
-    team_comparison['avg_picks_per_year'] = (team_comparison['total_picks'] / team_comparison['years_played']).round(1)
-    
-    # Create pivot table with averages
-    team_comparison_pivot = team_comparison.pivot(index='team_name', columns='position', values='avg_picks_per_year').fillna(0)
+    # Divide by each team's years played (aligned on the team level, no merge)
+    # and pivot positions into columns
+    team_comparison_pivot = total_picks.div(years_played, level='team_name').round(1).unstack(fill_value=0)
+    team_years = years_played.reset_index(name='years_played')
     
     # Show years played info
     st.info("📊 **Chart shows average picks per year** to fairly compare teams that played different numbers of years")
@@ -974,45 +1105,16 @@ def team_analysis_tab(df):
     with col2:
         st.subheader("Years Played")
         years_df = team_years.sort_values('years_played', ascending=False)
-        st.dataframe(years_df, use_container_width=True, hide_index=True)
+        st.markdown(table_html(years_df), unsafe_allow_html=True)
     
     with col1:
-        # Create heatmap with text annotations
-        fig_comparison = px.imshow(
-            team_comparison_pivot.values,
-            x=team_comparison_pivot.columns,
-            y=team_comparison_pivot.index,
-            title="Team Position Preferences Comparison (Avg Picks Per Year)",
-            color_continuous_scale="Viridis",
-            text_auto=True,  # This adds the numbers automatically
-            aspect="auto"    # This helps with spacing
-        )
-        
-        # Improve layout and spacing
-        fig_comparison.update_layout(
-            height=600,  # Make it taller for better spacing
-            font=dict(size=12),  # Larger font for readability
-            title_font_size=16,
-            xaxis_title="Position",
-            yaxis_title="Team",
-            coloraxis_colorbar=dict(
-                title="Avg Picks Per Year",
-                title_font_size=12
-            )
-        )
-    
-        # Improve text appearance
-        fig_comparison.update_traces(
-            textfont_size=12,
-            textfont_color="white"  # White text for better contrast
-        )
-        
-        st.plotly_chart(fig_comparison, use_container_width=True)
+        fig_comparison = build_team_comparison_fig(team_comparison_pivot)
+        st.plotly_chart(fig_comparison, width="stretch", key="team_comparison")
     
     # Team drafting patterns
     st.subheader("Team Draft Strategies")
     
-    selected_team = st.selectbox("Select Team", sorted(df['team_name'].unique()))
+    selected_team = st.selectbox("Select Team", load_draft_meta(*filters).teams)
     
     team_data = df[df['team_name'] == selected_team]
     
@@ -1021,18 +1123,13 @@ def team_analysis_tab(df):
     with col1:
         # Team's position preferences
         team_positions = team_data['position'].value_counts()
+        team_positions = team_positions[team_positions > 0]
         team_pos_df = pd.DataFrame({
             'Position': team_positions.index,
             'Count': team_positions.values
         })
-        fig_team_pos = px.bar(
-            team_pos_df,
-            x='Count',
-            y='Position',
-            orientation='h',
-            title=f"{selected_team} - Position Preferences"
-        )
-        st.plotly_chart(fig_team_pos, use_container_width=True)
+        fig_team_pos = build_count_bar_fig(team_pos_df, 'Count', 'Position', f"{selected_team} - Position Preferences", orientation='h')
+        st.plotly_chart(fig_team_pos, width="stretch", key="team_positions")
     
     with col2:
         # Team's draft picks by round
@@ -1041,23 +1138,24 @@ def team_analysis_tab(df):
             'Round': team_rounds.index,
             'Picks': team_rounds.values
         })
-        fig_team_rounds = px.bar(
-            team_rounds_df,
-            x='Round',
-            y='Picks',
-            title=f"{selected_team} - Picks by Round"
-        )
-        st.plotly_chart(fig_team_rounds, use_container_width=True)
+        fig_team_rounds = build_count_bar_fig(team_rounds_df, 'Round', 'Picks', f"{selected_team} - Picks by Round")
+        st.plotly_chart(fig_team_rounds, width="stretch", key="team_rounds")
     
     # Recent team picks
     st.subheader(f"{selected_team} - Recent Picks")
-    team_recent = team_data.nlargest(10, 'overall_pick')[['overall_pick', 'round_number', 'first_name', 'last_name', 'position', 'nfl_team']]
-    st.dataframe(team_recent, use_container_width=True)
+    picks_desc = sort_picks_desc(df)
+    team_recent = picks_desc[picks_desc['team_name'] == selected_team].head(10)[['overall_pick', 'round_number', 'first_name', 'last_name', 'position', 'nfl_team']]
+    st.markdown(table_html(team_recent), unsafe_allow_html=True)
 
-def player_lookup_tab(df):
+# Fragment so searching only reruns this tab
+@st.fragment
+def player_lookup_tab():
     """Player lookup tab"""
     st.header("🔍 Player Lookup")
     
+    # The lookup always searches every pick, regardless of the filters
+    df = load_player_lookup_data()
+    
     # Search functionality
     col1, col2 = st.columns(2)
     
@@ -1067,34 +1165,35 @@ def player_lookup_tab(df):
     with col2:
         search_position = st.selectbox("Filter by Position", ["All"] + list(df['position'].unique()))
     
-    # Filter players
-    filtered_players = df.copy()
+    # Filter players with one combined mask
+    mask = np.ones(len(df), dtype=bool)
     
     if search_term:
-        filtered_players = filtered_players[
-            (filtered_players['first_name'].str.contains(search_term, case=False, na=False)) |
-            (filtered_players['last_name'].str.contains(search_term, case=False, na=False))
-        ]
+        mask &= df['_full_lower'].str.contains(search_term.lower(), regex=False, na=False).to_numpy()
     
     if search_position != "All":
-        filtered_players = filtered_players[filtered_players['position'] == search_position]
+        mask &= (df['position'] == search_position).to_numpy()
+    
+    filtered_players = df if mask.all() else df[mask]
     
     # Display results
     if not filtered_players.empty:
         st.subheader(f"Found {len(filtered_players)} players")
         
         display_cols = ['overall_pick', 'round_number', 'year', 'first_name', 'last_name', 'position', 'nfl_team', 'team_name']
-        st.dataframe(filtered_players[display_cols].sort_values('overall_pick'), use_container_width=True)
+        st.dataframe(filtered_players[display_cols].sort_values('overall_pick'), width="stretch")
         
         # Player draft history chart
         if len(filtered_players) > 0:
-            selected_player = st.selectbox(
-                "Select Player for Detailed View",
-                filtered_players.apply(lambda x: f"{x['first_name']} {x['last_name']} ({x['position']})", axis=1).unique()
-            )
+            player_options = (
+                filtered_players['first_name'].astype(str) + ' ' +
+                filtered_players['last_name'].astype(str) + ' (' +
+                filtered_players['position'].astype(str) + ')'
+            ).unique()
+            selected_player = st.selectbox("Select Player for Detailed View", player_options)
             
             if selected_player:
-                player_name = selected_player.split(' (')[0]
+                player_name = selected_player.rsplit(' (', 1)[0]
                 first_name, last_name = player_name.split(' ', 1)
                 
                 player_data = filtered_players[
@@ -1103,14 +1202,8 @@ def player_lookup_tab(df):
                 ]
                 
                 if len(player_data) > 1:
-                    fig_player = px.line(
-                        player_data.sort_values('year'),
-                        x='year',
-                        y='overall_pick',
-                        title=f"{selected_player} - Draft Position Over Time",
-                        markers=True
-                    )
-                    st.plotly_chart(fig_player, use_container_width=True)
+                    fig_player = build_player_fig(player_data[['year', 'overall_pick']].sort_values('year'), f"{selected_player} - Draft Position Over Time")
+                    st.plotly_chart(fig_player, width="stretch", key="player_history")
     else:
         st.info("No players found matching your search criteria.")
 
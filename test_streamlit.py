@@ -16,28 +16,47 @@ st.set_page_config(
 
 st.title("🏈 Fantasy Football Draft Analysis - Test")
 
+# Simple query
+QUERY = """
+SELECT 
+    dp.overall_pick,
+    dp.round_number,
+    t.team_name,
+    p.first_name,
+    p.last_name,
+    p.position
+FROM draft_picks dp
+JOIN teams t ON dp.team_id = t.team_id
+JOIN players p ON dp.player_id = p.player_id
+ORDER BY dp.overall_pick
+LIMIT 50
+"""
+
+@st.cache_resource
+def get_connection():
+    """Open one database connection shared across reruns"""
+    return sqlite3.connect("fantasy_draft.db", check_same_thread=False)
+
+@st.cache_data
+def load_picks():
+    """Load the first 50 picks with their team and position counts"""
+    conn = get_connection()
+    df = pd.read_sql_query(QUERY, conn)
+    
+    # Aggregate the same first 50 picks in SQLite
+    shown_picks = f"({QUERY}) shown"
+    unique_teams, unique_positions = conn.execute(
+        f"SELECT COUNT(DISTINCT team_name), COUNT(DISTINCT position) FROM {shown_picks}"
+    ).fetchone()
+    position_counts = pd.read_sql_query(
+        f"SELECT position, COUNT(*) as n FROM {shown_picks} GROUP BY position ORDER BY n DESC",
+        conn
+    )
+    return df, unique_teams, unique_positions, position_counts
+
 # Test database connection
 try:
-    conn = sqlite3.connect("fantasy_draft.db")
-    
-    # Simple query
-    query = """
-    SELECT 
-        dp.overall_pick,
-        dp.round_number,
-        t.team_name,
-        p.first_name,
-        p.last_name,
-        p.position
-    FROM draft_picks dp
-    JOIN teams t ON dp.team_id = t.team_id
-    JOIN players p ON dp.player_id = p.player_id
-    ORDER BY dp.overall_pick
-    LIMIT 50
-    """
-    
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    df, unique_teams, unique_positions, position_counts = load_picks()
     
     if not df.empty:
         st.success(f"✅ Database connected! Found {len(df)} draft picks (showing first 50)")
@@ -47,18 +66,17 @@ try:
         with col1:
             st.metric("Total Picks Shown", len(df))
         with col2:
-            st.metric("Unique Teams", df['team_name'].nunique())
+            st.metric("Unique Teams", unique_teams)
         with col3:
-            st.metric("Unique Positions", df['position'].nunique())
+            st.metric("Unique Positions", unique_positions)
         
         # Simple data table
         st.subheader("Recent Draft Picks")
-        st.dataframe(df.head(20), use_container_width=True)
+        st.dataframe(df.head(20), width="stretch")
         
         # Simple bar chart using st.bar_chart
         st.subheader("Position Distribution")
-        position_counts = df['position'].value_counts()
-        st.bar_chart(position_counts)
+        st.bar_chart(position_counts.set_index('position')['n'])
         
     else:
         st.error("Database connected but no data found")
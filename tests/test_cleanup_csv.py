@@ -0,0 +1,86 @@
+"""
+Check clean_csv_file against the original row-by-row csv module cleaner
+"""
+
+import csv
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleanup_csv import clean_csv_file, read_csv_as_strings
+
+UNICODE_WHITESPACE = ['\u2009', '\u2002', '\u2003', '\u2004', '\u2005',
+                      '\u2006', '\u2007', '\u2008', '\u200a', '\u200b']
+
+def reference_clean(input_file, output_file):
+    """The original cleaner: csv.reader in, per-cell replace/collapse/strip, csv.writer out"""
+    changes = {'non_breaking_spaces': 0, 'other_unicode': 0, 'lines_processed': 0}
+    with open(input_file, 'r', encoding='utf-8') as infile, \
+         open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        for row in csv.reader(infile):
+            cleaned_row = []
+            for cell in row:
+                changes['non_breaking_spaces'] += cell.count('\xa0')
+                cleaned_cell = cell.replace('\xa0', ' ')
+                for unicode_char in UNICODE_WHITESPACE:
+                    changes['other_unicode'] += cleaned_cell.count(unicode_char)
+                    cleaned_cell = cleaned_cell.replace(unicode_char, ' ')
+                cleaned_row.append(re.sub(r' +', ' ', cleaned_cell).strip())
+            writer.writerow(cleaned_row)
+            changes['lines_processed'] += 1
+    return changes
+
+CASES = {
+    'whitespace_only_row': 'A\n \n',
+    'blank_lines': 'a,b\n\nc,d\n\n',
+    'ragged_unquoted': 'a,b\nc,d,e\nf\n',
+    'ragged_quoted': '"a",b\nc,d,e\n\nf\n',
+    'bom': '\ufeffname,pos\nJosh\xa0 Allen ,QB\n',
+    'bom_quoted': '\ufeff"name",pos\n"Allen, Josh",QB\n',
+    'quoted_newline': '"Josh\n Allen",QB\n"\xa0Kyler  Murray\u2009",QB\n',
+    'unicode_no_trailing_newline': 'Josh Allen,\u200bQB\nKyler\xa0\xa0Murray ,QB',
+    'whitespace_cells_ragged': 'a, ,c\n\u2009\nd\n  \n',
+    'quoted_regular': '"Allen, Josh",QB\n"Murray,\xa0 Kyler ",QB \n',
+    'quoted_escaped_quotes': '"say ""hi""",b\n"c",""\n',
+    'quoted_single_column': '"a"\n""\n\u200b\n',
+    'quote_inside_field': 'a"b,c\n"d",e\n',
+    'space_before_quote': ' "a",b\n"c",d\n',
+    'empty': '',
+}
+
+@pytest.mark.parametrize('text', CASES.values(), ids=CASES.keys())
+def test_matches_reference_cleaner(tmp_path, text):
+    input_file = tmp_path / 'input.csv'
+    with open(input_file, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    
+    expected_changes = reference_clean(input_file, tmp_path / 'expected.csv')
+    output_file, changes = clean_csv_file(str(input_file), str(tmp_path / 'actual.csv'), backup=False)
+    
+    assert (tmp_path / 'actual.csv').read_bytes() == (tmp_path / 'expected.csv').read_bytes()
+    assert changes == expected_changes
+
+def test_only_regular_text_goes_to_pandas():
+    assert read_csv_as_strings(CASES['quoted_regular']) is not None
+    assert read_csv_as_strings(CASES['quoted_escaped_quotes']) is not None
+    for name in ('blank_lines', 'ragged_quoted', 'bom_quoted', 'quoted_single_column',
+                 'quote_inside_field', 'space_before_quote', 'empty'):
+        assert read_csv_as_strings(CASES[name]) is None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DATA_FILES = sorted(f for f in os.listdir(DATA_DIR) if f.endswith('.csv')) if os.path.isdir(DATA_DIR) else []
+
+@pytest.mark.parametrize('name', DATA_FILES)
+def test_data_files_match_reference_cleaner(tmp_path, name):
+    input_file = os.path.join(DATA_DIR, name)
+    
+    expected_changes = reference_clean(input_file, tmp_path / 'expected.csv')
+    output_file, changes = clean_csv_file(input_file, str(tmp_path / 'actual.csv'), backup=False)
+    
+    assert (tmp_path / 'actual.csv').read_bytes() == (tmp_path / 'expected.csv').read_bytes()
+    assert changes == expected_changes
@@ -0,0 +1,27 @@
+"""
+Check the dashboard's pure helpers
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit_app import most_picked_position
+
+def test_most_picked_position_prefers_higher_count():
+    counts = np.array([1, 3, 2])
+    first_picks = np.array([20240001, 20240009, 20240002])
+    assert most_picked_position(counts, first_picks) == 1
+
+def test_most_picked_position_ties_go_to_first_picked():
+    # QB and WR tie; WR was picked first (earlier year, then earlier pick),
+    # which is the position value_counts lists first
+    counts = np.array([0, 1, 1])  # Def, QB, WR
+    first_picks = np.array([np.iinfo('int64').max, 20240009, 20240008])
+    assert most_picked_position(counts, first_picks) == 2
+    
+    first_picks = np.array([np.iinfo('int64').max, 20230050, 20240001])
+    assert most_picked_position(counts, first_picks) == 1